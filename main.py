@@ -1,15 +1,29 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, validator
 from typing import Optional, List
 from datetime import datetime
-import shutil
+from collections import defaultdict, Counter
+from functools import lru_cache
+import asyncio
+import base64
+import itertools
+import logging
+import re
 import os
+import sqlite3
+import time
+import aiofiles
+import orjson
 from pathlib import Path
+from sortedcontainers import SortedKeyList, SortedSet
 import uuid
 
-app = FastAPI(title="Blog API", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Blog API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -23,14 +37,101 @@ app.add_middleware(
 # Create directories for uploads
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+
+ALLOWED_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "gif", "webp"})
+IMAGE_MAGIC_PREFIXES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
+# In production /uploads should be served by the reverse proxy (see
+# deploy/nginx.conf) so image bytes never pass through Python; set
+# SERVE_UPLOADS=0 there to drop the dev-only StaticFiles mount
+if os.getenv("SERVE_UPLOADS", "1") == "1":
+    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+
+# SQLite persistence (WAL mode): the dicts below stay the read path,
+# every mutation is written through so state survives restarts
+DB_PATH = os.getenv("BLOG_DB", "blog.db")
+
+def init_db():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY,
+            author TEXT NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            published INTEGER NOT NULL,
+            views INTEGER NOT NULL,
+            image_url TEXT,
+            created_at_ns INTEGER NOT NULL,
+            updated_at_ns INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE TABLE IF NOT EXISTS post_tags (post_id INTEGER NOT NULL, tag TEXT NOT NULL)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_post_tags_post ON post_tags(post_id)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY,
+            post_id INTEGER NOT NULL,
+            author TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at_ns INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comments_post ON comments(post_id)")
+    return conn
+
+# Writes run synchronously on the event loop by design: under WAL with
+# synchronous=NORMAL each statement is microseconds, below the cost of
+# hopping to a thread, and they already serialize under write_lock
+db = init_db()
 
 # In-memory databases
 posts_db = {}
 comments_db = {}
-tags_db = set()
-post_counter = 0
-comment_counter = 0
+tags_db = SortedSet()  # kept in order on insert so /tags never re-sorts
+tags_list_cache = None  # materialized list for /tags, dropped when a tag appears
+next_post_id = itertools.count(1).__next__  # atomic under the GIL
+next_comment_id = itertools.count(1).__next__
+
+# Serializes multi-structure writes so interleaved requests can't leave
+# the databases and their indexes out of sync
+write_lock = asyncio.Lock()
+
+# Timestamps are stored as epoch nanoseconds so sort keys are plain
+# integer compares; conversion to datetime happens only when serializing
+def created_sort_key(post: dict):
+    return (-post["created_at_ns"], post["id"])
+
+def comment_sort_key(comment: dict):
+    return (-comment["created_at_ns"], comment["id"])
+
+# Read-path indexes, maintained at write time so list endpoints stay O(result)
+tag_index = defaultdict(set)  # lowercased tag -> post ids
+published_index = set()  # ids of published posts
+posts_by_created = SortedKeyList(key=created_sort_key)  # post dicts, newest first
+comments_by_post = defaultdict(lambda: SortedKeyList(key=comment_sort_key))
+token_index = defaultdict(set)  # search token -> post ids
+post_tokens = {}  # post_id -> tokens currently in token_index
+post_search_blobs = {}  # post_id -> lowercased "title\ncontent" for substring checks
+post_serialized_cache = {}  # post_id -> orjson bytes, invalidated on any mutation
+
+# Running stats counters, updated at write time so /stats never rescans
+published_count = 0
+draft_count = 0
+total_views_counter = 0
+tag_counts = Counter()
+
+# View increments are buffered here and flushed to posts_db periodically,
+# turning one dict write per read into one batched write per interval
+pending_views = Counter()
+VIEW_FLUSH_INTERVAL = 2.0
+view_flush_task = None  # strong reference so the task can't be collected
 
 # Models
 class Tag(BaseModel):
@@ -71,6 +172,7 @@ class PaginatedPosts(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 class CommentBase(BaseModel):
     content: str
@@ -93,21 +195,236 @@ class PostStats(BaseModel):
     popular_tags: List[dict]
 
 # Helper functions
+def ns_to_datetime(ns: int):
+    return datetime.utcfromtimestamp(ns / 1e9)
+
+def public_post(post: dict):
+    public = dict(post)
+    public["created_at"] = ns_to_datetime(public.pop("created_at_ns"))
+    public["updated_at"] = ns_to_datetime(public.pop("updated_at_ns"))
+    return public
+
+def public_comment(comment: dict):
+    public = dict(comment)
+    public["created_at"] = ns_to_datetime(public.pop("created_at_ns"))
+    return public
+
+def sniff_image_type(header: bytes):
+    for prefix, mimetype in IMAGE_MAGIC_PREFIXES.items():
+        if header.startswith(prefix):
+            return mimetype
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+def persist_post(post: dict):
+    db.execute(
+        "INSERT OR REPLACE INTO posts (id, author, title, content, published, views, image_url, created_at_ns, updated_at_ns) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (post["id"], post["author"], post["title"], post["content"], int(post["published"]),
+         post["views"], post["image_url"], post["created_at_ns"], post["updated_at_ns"])
+    )
+    db.execute("DELETE FROM post_tags WHERE post_id = ?", (post["id"],))
+    db.executemany(
+        "INSERT INTO post_tags (post_id, tag) VALUES (?, ?)",
+        [(post["id"], tag) for tag in post["tags"]]
+    )
+
+def persist_comment(comment: dict):
+    db.execute(
+        "INSERT INTO comments (id, post_id, author, content, created_at_ns) VALUES (?, ?, ?, ?, ?)",
+        (comment["id"], comment["post_id"], comment["author"], comment["content"], comment["created_at_ns"])
+    )
+
+def load_db():
+    global next_post_id, next_comment_id, total_views_counter
+    for row in db.execute("SELECT id, author, image_url, views, created_at_ns, updated_at_ns, title, content, published FROM posts"):
+        post = {
+            "id": row[0],
+            "author": row[1],
+            "image_url": row[2],
+            "views": row[3],
+            "created_at_ns": row[4],
+            "updated_at_ns": row[5],
+            "title": row[6],
+            "content": row[7],
+            "published": bool(row[8]),
+            "tags": [tag for (tag,) in db.execute("SELECT tag FROM post_tags WHERE post_id = ?", (row[0],))]
+        }
+        posts_db[post["id"]] = post
+        index_post(post)
+        posts_by_created.add(post)
+        total_views_counter += post["views"]
+        for tag in post["tags"]:
+            register_tag(tag)
+    for row in db.execute("SELECT id, post_id, created_at_ns, content, author FROM comments"):
+        comment = {"id": row[0], "post_id": row[1], "created_at_ns": row[2], "content": row[3], "author": row[4]}
+        comments_db[comment["id"]] = comment
+        comments_by_post[comment["post_id"]].add(comment)
+    next_post_id = itertools.count(max(posts_db, default=0) + 1).__next__
+    next_comment_id = itertools.count(max(comments_db, default=0) + 1).__next__
+
 def get_post_or_404(post_id: int):
     post = posts_db.get(post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
 
+def tokenize(text: str):
+    return set(re.findall(r"\w+", text.lower()))
+
+def register_tag(tag: str):
+    global tags_list_cache
+    tag_lower = tag.lower()
+    if tag_lower not in tags_db:
+        tags_db.add(tag_lower)
+        tags_list_cache = None
+
+@lru_cache(maxsize=None)
+def build_candidate_fn(has_tag: bool, has_published: bool, has_search: bool):
+    """Compile a candidate-id builder specialized for one filter shape.
+
+    Generating the function per (has_tag, has_published, has_search)
+    combination fuses the active filters into one pass and compiles the
+    branches for absent filters away entirely; lru_cache keeps one
+    function per shape (8 variants).
+    """
+    if not (has_tag or has_published or has_search):
+        return lambda tag, published, search: None
+
+    lines = ["def candidates(tag, published, search):"]
+    if has_tag:
+        lines.append("    ids = set(tag_index.get(tag, ()))")
+    if has_published:
+        if has_tag:
+            lines.append("    ids &= published_index if published else posts_db.keys() - published_index")
+        else:
+            lines.append("    ids = set(published_index) if published else posts_db.keys() - published_index")
+    if has_search:
+        if not (has_tag or has_published):
+            lines.append("    ids = posts_db")
+        lines.append("    search_tokens = tokenize(search)")
+        lines.append("    if search_tokens:")
+        lines.append("        posting = [token_index.get(t) for t in search_tokens]")
+        lines.append("        if None in posting:")
+        lines.append("            return set()")
+        lines.append("        token_ids = set.intersection(*posting)")
+        if has_tag or has_published:
+            lines.append("        ids &= token_ids")
+        else:
+            lines.append("        ids = token_ids")
+        lines.append("    return {pid for pid in ids if search in post_search_blobs[pid]}")
+    else:
+        lines.append("    return ids")
+
+    namespace = {}
+    exec("\n".join(lines), globals(), namespace)
+    return namespace["candidates"]
+
+def index_post(post: dict):
+    global published_count, draft_count
+    post_id = post["id"]
+    for tag in post["tags"]:
+        tag_index[tag.lower()].add(post_id)
+        tag_counts[tag] += 1
+    if post["published"]:
+        published_index.add(post_id)
+        published_count += 1
+    else:
+        draft_count += 1
+    search_blob = (post["title"] + "\n" + post["content"]).lower()
+    post_search_blobs[post_id] = search_blob
+    tokens = set(re.findall(r"\w+", search_blob))
+    post_tokens[post_id] = tokens
+    for token in tokens:
+        token_index[token].add(post_id)
+
+def deindex_post(post: dict):
+    global published_count, draft_count
+    post_id = post["id"]
+    for tag in post["tags"]:
+        ids = tag_index.get(tag.lower())
+        if ids is not None:
+            ids.discard(post_id)
+            if not ids:
+                del tag_index[tag.lower()]
+        tag_counts[tag] -= 1
+        if tag_counts[tag] <= 0:
+            del tag_counts[tag]
+    if post["published"]:
+        published_count -= 1
+    else:
+        draft_count -= 1
+    published_index.discard(post_id)
+    post_search_blobs.pop(post_id, None)
+    post_serialized_cache.pop(post_id, None)
+    for token in post_tokens.pop(post_id, ()):
+        ids = token_index.get(token)
+        if ids is not None:
+            ids.discard(post_id)
+            if not ids:
+                del token_index[token]
+
 def increment_views(post_id: int):
+    global total_views_counter
     if post_id in posts_db:
-        posts_db[post_id]["views"] += 1
+        pending_views[post_id] += 1
+        total_views_counter += 1
+
+async def apply_pending_views():
+    if not pending_views:
+        return
+    async with write_lock:
+        flushed = []
+        for post_id, count in pending_views.items():
+            post = posts_db.get(post_id)
+            if post is not None:
+                post["views"] += count
+                post_serialized_cache.pop(post_id, None)
+                flushed.append((post["views"], post_id))
+        pending_views.clear()
+        db.executemany("UPDATE posts SET views = ? WHERE id = ?", flushed)
+
+async def flush_pending_views():
+    while True:
+        await asyncio.sleep(VIEW_FLUSH_INTERVAL)
+        try:
+            await apply_pending_views()
+        except Exception:
+            # Keep the loop alive; absolute view values self-heal on the
+            # next successful flush
+            logger.exception("View flush failed; retrying next interval")
 
 def calculate_pagination(total: int, page: int, page_size: int):
     total_pages = (total + page_size - 1) // page_size
     return total_pages
 
+def encode_cursor(post: dict):
+    return base64.urlsafe_b64encode(f"{post['created_at_ns']}:{post['id']}".encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        ns_raw, _, id_raw = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+        return (-int(ns_raw), int(id_raw))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Rebuild the in-memory read path from SQLite on startup
+load_db()
+
 # Routes
+@app.on_event("startup")
+async def start_view_flush():
+    global view_flush_task
+    view_flush_task = asyncio.create_task(flush_pending_views())
+
+@app.on_event("shutdown")
+async def stop_view_flush():
+    if view_flush_task is not None:
+        view_flush_task.cancel()
+    # Persist whatever is still buffered so a clean restart loses nothing
+    await apply_pending_views()
+
 @app.get("/")
 async def root():
     return {
@@ -121,186 +438,254 @@ async def root():
 
 @app.post("/posts", response_model=Post, status_code=201)
 async def create_post(post: PostCreate, author: str = Query(..., min_length=3)):
-    global post_counter
-    post_counter += 1
-    now = datetime.utcnow()
-    
-    for tag in post.tags:
-        tags_db.add(tag.lower())
-    
+    new_id = next_post_id()
+    now = time.time_ns()
+
     post_data = {
-        "id": post_counter,
+        "id": new_id,
         "author": author,
         "image_url": None,
         "views": 0,
-        "created_at": now,
-        "updated_at": now,
+        "created_at_ns": now,
+        "updated_at_ns": now,
         **post.dict()
     }
-    posts_db[post_counter] = post_data
-    return Post(**post_data)
+    async with write_lock:
+        for tag in post.tags:
+            register_tag(tag)
+        posts_db[new_id] = post_data
+        index_post(post_data)
+        posts_by_created.add(post_data)
+        persist_post(post_data)
+    return Post(**public_post(post_data))
 
 @app.post("/posts/{post_id}/image")
 async def upload_post_image(post_id: int, file: UploadFile = File(...)):
     post = get_post_or_404(post_id)
-    
-    if not file.content_type.startswith("image/"):
+
+    # Validate the extension against an allowlist and the content against
+    # image magic bytes rather than trusting the client-supplied header
+    file_extension = Path(file.filename or "").suffix.lstrip(".").lower()
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="File type not allowed")
+
+    first_chunk = await file.read(1 << 20)
+    if sniff_image_type(first_chunk[:32]) is None:
         raise HTTPException(status_code=400, detail="File must be an image")
-    
-    file_extension = file.filename.split(".")[-1]
+
     unique_filename = f"{uuid.uuid4()}.{file_extension}"
     file_path = UPLOAD_DIR / unique_filename
+
+    # Stream to disk in chunks without blocking the event loop
+    async with aiofiles.open(file_path, "wb") as buffer:
+        await buffer.write(first_chunk)
+        while chunk := await file.read(1 << 20):
+            await buffer.write(chunk)
     
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    post["image_url"] = f"/uploads/{unique_filename}"
-    post["updated_at"] = datetime.utcnow()
+    async with write_lock:
+        # The post may have been deleted while the file streamed; persisting
+        # through the stale reference would resurrect its row in SQLite
+        if post_id not in posts_db:
+            file_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=404, detail="Post not found")
+        post["image_url"] = f"/uploads/{unique_filename}"
+        post["updated_at_ns"] = time.time_ns()
+        post_serialized_cache.pop(post_id, None)
+        persist_post(post)
     
     return {"message": "Image uploaded successfully", "image_url": post["image_url"]}
 
-@app.get("/posts", response_model=PaginatedPosts)
+@app.get("/posts", response_model=None)
 async def get_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     tag: Optional[str] = None,
     published: Optional[bool] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    after: Optional[str] = None
 ):
-    filtered_posts = list(posts_db.values())
-    
-    if tag:
-        filtered_posts = [p for p in filtered_posts if tag.lower() in [t.lower() for t in p["tags"]]]
-    
-    if published is not None:
-        filtered_posts = [p for p in filtered_posts if p["published"] == published]
-    
-    if search:
-        search_lower = search.lower()
-        filtered_posts = [
-            p for p in filtered_posts 
-            if search_lower in p["title"].lower() or search_lower in p["content"].lower()
-        ]
-    
-    filtered_posts.sort(key=lambda x: x["created_at"], reverse=True)
-    
-    total = len(filtered_posts)
+    candidate_fn = build_candidate_fn(bool(tag), published is not None, bool(search))
+    candidate_ids = candidate_fn(
+        tag.lower() if tag else None,
+        published,
+        search.lower() if search else None
+    )
+
+    total = len(candidate_ids) if candidate_ids is not None else len(posts_db)
     total_pages = calculate_pagination(total, page, page_size)
-    start = (page - 1) * page_size
+
+    # A cursor seeks straight to its position, so deep pages cost the same
+    # as page one; offset paging is kept for compatibility
+    if after:
+        posts_in_order = posts_by_created.irange_key(decode_cursor(after), inclusive=(False, True))
+        start = 0
+    else:
+        posts_in_order = posts_by_created
+        start = (page - 1) * page_size
+
+    # Walk the pre-sorted index and stop once the page is full; bind the
+    # per-item lookups once so the loop body is only C-level calls
+    paginated_posts = []
+    append_post = paginated_posts.append
+    in_candidates = candidate_ids.__contains__ if candidate_ids is not None else None
+    matches_seen = 0
     end = start + page_size
-    paginated_posts = filtered_posts[start:end]
-    
-    return PaginatedPosts(
-        items=[Post(**p) for p in paginated_posts],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    for post in posts_in_order:
+        if in_candidates is not None and not in_candidates(post["id"]):
+            continue
+        matches_seen += 1
+        if matches_seen <= start:
+            continue
+        append_post(post)
+        if matches_seen == end:
+            break
+
+    next_cursor = encode_cursor(paginated_posts[-1]) if len(paginated_posts) == page_size else None
+
+    # Convert timestamps for the page slice only; skip re-validating the dicts
+    return {
+        "items": [public_post(p) for p in paginated_posts],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "next_cursor": next_cursor
+    }
 
 @app.get("/posts/{post_id}", response_model=Post)
 async def get_post(post_id: int):
     post = get_post_or_404(post_id)
     increment_views(post_id)
-    return Post(**post)
+
+    # Serve cached orjson bytes. View increments only buffer into
+    # pending_views, so the views shown here can lag the true count by up
+    # to VIEW_FLUSH_INTERVAL; the flush evicts the entry when it applies
+    # the buffered counts. Post edits, deletes, and uploads evict directly.
+    cached = post_serialized_cache.get(post_id)
+    if cached is None:
+        cached = orjson.dumps(public_post(post))
+        post_serialized_cache[post_id] = cached
+    return Response(content=cached, media_type="application/json")
 
 @app.put("/posts/{post_id}", response_model=Post)
 async def update_post(post_id: int, post_update: PostUpdate):
     post = get_post_or_404(post_id)
     
     update_data = post_update.dict(exclude_unset=True)
-    
-    if "tags" in update_data:
-        for tag in update_data["tags"]:
-            tags_db.add(tag.lower())
-    
-    for field, value in update_data.items():
-        post[field] = value
-    
-    post["updated_at"] = datetime.utcnow()
-    return Post(**post)
+
+    async with write_lock:
+        if "tags" in update_data:
+            for tag in update_data["tags"]:
+                register_tag(tag)
+
+        deindex_post(post)
+        for field, value in update_data.items():
+            post[field] = value
+        index_post(post)
+
+        post["updated_at_ns"] = time.time_ns()
+        persist_post(post)
+    return Post(**public_post(post))
 
 @app.delete("/posts/{post_id}", status_code=204)
 async def delete_post(post_id: int):
+    global total_views_counter
     post = get_post_or_404(post_id)
-    
+
     if post.get("image_url"):
         image_path = UPLOAD_DIR / post["image_url"].split("/")[-1]
         if image_path.exists():
             image_path.unlink()
-    
-    comments_to_delete = [cid for cid, c in comments_db.items() if c["post_id"] == post_id]
-    for cid in comments_to_delete:
-        del comments_db[cid]
-    
-    del posts_db[post_id]
+
+    async with write_lock:
+        total_views_counter -= post["views"] + pending_views.pop(post_id, 0)
+        # Cascade through the per-post mapping instead of scanning every comment
+        for comment in comments_by_post.pop(post_id, ()):
+            del comments_db[comment["id"]]
+
+        deindex_post(post)
+        posts_by_created.remove(post)
+        del posts_db[post_id]
+        db.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+        db.execute("DELETE FROM post_tags WHERE post_id = ?", (post_id,))
+        db.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
     return None
 
 @app.post("/posts/{post_id}/comments", response_model=Comment, status_code=201)
 async def create_comment(post_id: int, comment: CommentCreate):
     get_post_or_404(post_id)
-    
-    global comment_counter
-    comment_counter += 1
-    
+
+    new_id = next_comment_id()
     comment_data = {
-        "id": comment_counter,
+        "id": new_id,
         "post_id": post_id,
-        "created_at": datetime.utcnow(),
+        "created_at_ns": time.time_ns(),
         **comment.dict()
     }
-    comments_db[comment_counter] = comment_data
-    return Comment(**comment_data)
+    async with write_lock:
+        comments_db[new_id] = comment_data
+        comments_by_post[post_id].add(comment_data)
+        persist_comment(comment_data)
+    return Comment(**public_comment(comment_data))
 
-@app.get("/posts/{post_id}/comments", response_model=List[Comment])
+@app.get("/posts/{post_id}/comments", response_model=None)
 async def get_comments(post_id: int):
     get_post_or_404(post_id)
-    post_comments = [c for c in comments_db.values() if c["post_id"] == post_id]
-    post_comments.sort(key=lambda x: x["created_at"], reverse=True)
-    return [Comment(**c) for c in post_comments]
+    # Already kept newest-first, so no per-request sort
+    return [public_comment(c) for c in comments_by_post.get(post_id, ())]
 
 @app.delete("/comments/{comment_id}", status_code=204)
 async def delete_comment(comment_id: int):
     if comment_id not in comments_db:
         raise HTTPException(status_code=404, detail="Comment not found")
-    del comments_db[comment_id]
+    async with write_lock:
+        comment = comments_db.pop(comment_id)
+        post_comments = comments_by_post.get(comment["post_id"])
+        if post_comments is not None:
+            post_comments.remove(comment)
+            if not post_comments:
+                del comments_by_post[comment["post_id"]]
+        db.execute("DELETE FROM comments WHERE id = ?", (comment_id,))
     return None
 
 @app.get("/tags", response_model=List[str])
 async def get_tags():
-    return sorted(list(tags_db))
+    global tags_list_cache
+    if tags_list_cache is None:
+        tags_list_cache = list(tags_db)  # already in sorted order
+    return tags_list_cache
 
-@app.get("/tags/{tag_name}/posts", response_model=List[Post])
+@app.get("/tags/{tag_name}/posts", response_model=None)
 async def get_posts_by_tag(tag_name: str):
-    tag_posts = [
-        p for p in posts_db.values() 
-        if tag_name.lower() in [t.lower() for t in p["tags"]]
-    ]
-    tag_posts.sort(key=lambda x: x["created_at"], reverse=True)
-    return [Post(**p) for p in tag_posts]
+    tag_ids = tag_index.get(tag_name.lower())
+    if not tag_ids:
+        return []
+    # Walk the pre-sorted index; stop once every tagged post has been seen
+    tag_posts = []
+    append_post = tag_posts.append
+    in_tag = tag_ids.__contains__
+    remaining = len(tag_ids)
+    for post in posts_by_created:
+        if in_tag(post["id"]):
+            append_post(post)
+            remaining -= 1
+            if not remaining:
+                break
+    return [public_post(p) for p in tag_posts]
 
 @app.get("/stats", response_model=PostStats)
 async def get_stats():
-    all_posts = list(posts_db.values())
-    published = [p for p in all_posts if p["published"]]
-    drafts = [p for p in all_posts if not p["published"]]
-    total_views = sum(p["views"] for p in all_posts)
-    
-    tag_counts = {}
-    for post in all_posts:
-        for tag in post["tags"]:
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-    
+    # Bounded-heap top-5 instead of sorting every tag count
     popular_tags = [
-        {"tag": tag, "count": count} 
-        for tag, count in sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        {"tag": tag, "count": count}
+        for tag, count in tag_counts.most_common(5)
     ]
-    
+
     return PostStats(
-        total_posts=len(all_posts),
-        published_posts=len(published),
-        draft_posts=len(drafts),
-        total_views=total_views,
+        total_posts=len(posts_db),
+        published_posts=published_count,
+        draft_posts=draft_count,
+        total_views=total_views_counter,
         total_comments=len(comments_db),
         popular_tags=popular_tags
     )